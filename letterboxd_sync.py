@@ -3,21 +3,42 @@ import sys
 import subprocess
 import venv
 import argparse
+import asyncio
 import json
 import time
-import requests
 import re
 import logging
+from datetime import datetime, timedelta, timezone
 CONFIG_FILE = "config.json"
+LIBRARY_CACHE_FILE = "emby_cache.json"
+LIBRARY_FULL_REFRESH_SECONDS = 24 * 60 * 60  # Refetch the whole library daily so deleted movies drop out of the cache
+EMBY_PAGE_SIZE = 500  # Number of movies requested per Emby library page
+EMBY_SEARCH_CONCURRENCY = 8  # Number of Emby title searches run concurrently
+SEARCH_LOOKUP_MAX_TITLES = 50  # Watchlists up to this size are looked up with Emby's search when there is no library cache
+WATCHLIST_PAGE_SIZE = 28  # Letterboxd shows 28 posters per full watchlist page
+WATCHLIST_BATCH_SIZE = 4  # Number of watchlist pages fetched concurrently
+USER_SYNC_CONCURRENCY = 4  # Number of users synced concurrently
+USER_AGENT = "emby-letterboxd-sync"
+TICKS_PER_MINUTE = 10**7 * 60  # Emby stores runtime in ticks: 10^7 ticks per second, 60 seconds per minute
+FUZZY_MATCH_THRESHOLD = 95  # Minimum rapidfuzz ratio score for a watchlist title to match an Emby movie
+RUNTIME_TOLERANCE_MINUTES = 1  # Runtimes within this many minutes are treated as the same release
+REQUIRED_PACKAGES = ['beautifulsoup4', 'lxml', 'requests', 'rapidfuzz', 'aiohttp', 'numpy', 'orjson']
+VENV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'venv')
+VENV_BIN = 'bin' if os.name != 'nt' else 'Scripts'
+VENV_PIP = os.path.join(VENV_DIR, VENV_BIN, 'pip')
+VENV_PYTHON = os.path.join(VENV_DIR, VENV_BIN, 'python')
+_DEPS_OK = False
 
 def init_dependencies():
     """
     Ensure that a virtual environment exists and required packages are installed.
     If the virtual environment does not exist, it is created and necessary packages are installed.
     The script is then re-executed within the virtual environment.
+    Once the dependencies have been verified, later calls return immediately.
     """
-    REQUIRED_PACKAGES = ['beautifulsoup4', 'requests', 'rapidfuzz']
-    VENV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'venv')
+    global _DEPS_OK
+    if _DEPS_OK:
+        return
 
     def is_venv():
         return hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
@@ -25,30 +46,138 @@ def init_dependencies():
     def create_venv():
         print("Creating virtual environment...")
         venv.create(VENV_DIR, with_pip=True)
-        pip_path = os.path.join(VENV_DIR, 'bin', 'pip') if os.name != 'nt' else os.path.join(VENV_DIR, 'Scripts', 'pip')
         print("Installing required packages...")
-        subprocess.check_call([pip_path, 'install'] + REQUIRED_PACKAGES)
+        subprocess.check_call([VENV_PIP, 'install'] + REQUIRED_PACKAGES)
 
     if not is_venv():
         if not os.path.exists(VENV_DIR):
             create_venv()
-        python_path = os.path.join(VENV_DIR, 'bin', 'python') if os.name != 'nt' else os.path.join(VENV_DIR, 'Scripts', 'python')
-        os.execv(python_path, [python_path] + sys.argv)
+        os.execv(VENV_PYTHON, [VENV_PYTHON] + sys.argv)
 
     try:
         import bs4
+        import lxml
         import requests
         from rapidfuzz import fuzz
+        import aiohttp
+        import numpy
+        import orjson
     except ImportError:
-        pip_path = os.path.join(sys.prefix, 'bin', 'pip') if os.name != 'nt' else os.path.join(sys.prefix, 'Scripts', 'pip')
         print("Installing missing dependencies...")
-        subprocess.check_call([pip_path, 'install'] + REQUIRED_PACKAGES)
+        subprocess.check_call([os.path.join(sys.prefix, VENV_BIN, 'pip'), 'install'] + REQUIRED_PACKAGES)
         os.execv(sys.executable, [sys.executable] + sys.argv)
+    _DEPS_OK = True
 
 init_dependencies()
 
-from bs4 import BeautifulSoup
-from rapidfuzz import fuzz
+import aiohttp
+import numpy as np
+import orjson
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from rapidfuzz import fuzz, process, utils
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+# Shared session for the blocking Emby calls so keep-alive connections are reused
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT})
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Only film-poster subtrees of a watchlist page are needed, so the parser skips building the rest.
+# The strainer sees the raw class attribute, so match film-poster as one of several space-separated classes.
+POSTER_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)film-poster(?:\s|$)'))
+# The first page is also searched for the paginator, which lists the total number of pages
+FIRST_PAGE_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)(?:film-poster|paginate-pages)(?:\s|$)'))
+
+def create_http_session():
+    """
+    Create the aiohttp session shared by all requests made during a sync.
+    
+    Returns:
+        aiohttp.ClientSession: A session with a bounded connection pool.
+    """
+    connector = aiohttp.TCPConnector(limit=8)
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT})
+
+class EmbyClient:
+    """
+    Client for the Emby API calls made during a sync.
+    The server URL and API key are read from the configuration once and bound together with the HTTP session.
+    Item queries only request the fields needed for matching.
+    """
+    ITEM_PARAMS = {"Fields": "RunTimeTicks", "EnableImages": "false", "EnableUserData": "false"}
+
+    def __init__(self, config, session):
+        """
+        Args:
+            config (dict): The configuration dictionary containing Emby details.
+            session (aiohttp.ClientSession): The shared HTTP session.
+        """
+        self.base = config["emby_url"].rstrip("/")
+        self.key = config["emby_api_key"]
+        self.session = session
+
+    async def get(self, path, params=None):
+        """
+        Send a GET request to the Emby API.
+        
+        Args:
+            path (str): The API path, starting with '/'.
+            params (dict, optional): Query parameters in addition to the API key.
+        
+        Returns:
+            The parsed JSON response.
+        """
+        async with self.session.get(f"{self.base}{path}", params={**(params or {}), "api_key": self.key}) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    async def server_id(self):
+        """
+        Returns:
+            str or None: The unique ID of the Emby server.
+        """
+        return (await self.get("/System/Info/Public")).get("Id")
+
+    async def items(self, **params):
+        """
+        Query library items.
+        
+        Args:
+            **params: Query parameters for the /Items endpoint.
+        
+        Returns:
+            list: The returned items.
+        """
+        return (await self.get("/Items", {**self.ITEM_PARAMS, **params}))["Items"]
+
+    async def playlist_items(self, playlist_id):
+        """
+        Args:
+            playlist_id (str): The ID of the playlist.
+        
+        Returns:
+            list: The items currently in the playlist.
+        """
+        return (await self.get(f"/Playlists/{playlist_id}/Items", self.ITEM_PARAMS)).get("Items", [])
+
+    async def add(self, playlist_id, ids, user_id):
+        """
+        Add items to a playlist.
+        
+        Args:
+            playlist_id (str): The ID of the playlist.
+            ids (list): The item IDs to add.
+            user_id (str): The Emby user ID.
+        """
+        params = {"Ids": ",".join(ids), "UserId": user_id, "api_key": self.key}
+        async with self.session.post(f"{self.base}/Playlists/{playlist_id}/Items", params=params) as response:
+            if not response.ok:
+                log.error("Response content: %s", await response.text())
+            response.raise_for_status()
 
 def load_config():
     """
@@ -93,50 +222,110 @@ def init_config():
     save_config(config)
     print(f"Configuration saved to '{CONFIG_FILE}'.")
 
-def get_letterboxd_watchlist(username):
+async def fetch_watchlist_page(session, username, page):
+    """
+    Fetch the raw HTML of a single Letterboxd watchlist page.
+
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        username (str): Letterboxd username.
+        page (int): The watchlist page number (1-based).
+
+    Returns:
+        str: The HTML of the page.
+    """
+    watchlist_url = f"https://letterboxd.com/{username}/watchlist/page/{page}/"
+    async with session.get(watchlist_url) as response:
+        response.raise_for_status()
+        return await response.text()
+
+def get_watchlist_page_count(soup):
+    """
+    Read the total number of watchlist pages from the paginator of a parsed watchlist page.
+    
+    Args:
+        soup (BeautifulSoup): The parsed watchlist page.
+    
+    Returns:
+        int or None: The number of the last page, or None if the page has no usable paginator.
+    """
+    last_page_link = soup.select_one('.paginate-pages li:last-child a')
+    if last_page_link is None:
+        return None
+    try:
+        return int(last_page_link.get_text(strip=True))
+    except ValueError:
+        return None
+
+async def get_letterboxd_watchlist(session, username):
     """
-    Fetch the given user's Letterboxd watchlist using bs4.
+    Fetch the given user's Letterboxd watchlist using bs4 with the lxml parser.
+    The first page is fetched on its own to read the page count from its paginator, then all remaining pages
+    are requested concurrently. Without a paginator, pages are requested in batches of WATCHLIST_BATCH_SIZE
+    until a page has fewer than WATCHLIST_PAGE_SIZE posters.
     
     Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
         username (str): Letterboxd username.
     
     Returns:
         list: A list of movie titles from the user's watchlist.
     """
     movies = []
-    page = 1
+    last_page = None
+    pages = range(1, 2)
     print(f"Fetching watchlist for {username}")
     while True:
-        watchlist_url = f"https://letterboxd.com/{username}/watchlist/page/{page}/"
-        try:
-            response = requests.get(watchlist_url)
-            response.raise_for_status()
+        results = await asyncio.gather(
+            *(fetch_watchlist_page(session, username, page) for page in pages),
+            return_exceptions=True
+        )
+
+        finished = False
+        for page, result in zip(pages, results):
+            if isinstance(result, aiohttp.ClientResponseError):
+                print(f"HTTP error occurred: {result}")
+                finished = True
+                break
+            if isinstance(result, Exception):
+                print(f"Error fetching watchlist for {username} on page {page}: {result}")
+                finished = True
+                break
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if page == 1:
+                soup = BeautifulSoup(result, 'lxml', parse_only=FIRST_PAGE_STRAINER)
+                last_page = get_watchlist_page_count(soup)
+            else:
+                soup = BeautifulSoup(result, 'lxml', parse_only=POSTER_STRAINER)
             film_items = soup.find_all('div', class_='film-poster')
             if not film_items:
                 print(f"Page {page}: No more posters found, stopping.")
+                finished = True
                 break
 
             for film in film_items:
                 img_tag = film.find('img', class_='image')
                 if img_tag and img_tag.get('alt'):
                     movie_title = img_tag['alt'].strip()
-                    print(f"Found movie: {movie_title}")
+                    log.debug("Found movie: %s", movie_title)
                     movies.append(movie_title)
                 else:
-                    print(f"Film-poster missing 'alt' attribute: {film}")
+                    log.warning("Film-poster missing 'alt' attribute: %s", film)
 
-            if len(film_items) < 28:
+            # Without a page count, a short page is the last one; ignore anything fetched beyond it in this batch
+            if last_page is None and len(film_items) < WATCHLIST_PAGE_SIZE:
+                finished = True
                 break
-            page += 1
 
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred: {http_err}")
-            break
-        except Exception as e:
-            print(f"Error fetching watchlist for {username} on page {page}: {e}")
+        if finished:
             break
+        if last_page is not None:
+            # All remaining pages are known, so request them at once
+            if pages.stop > last_page:
+                break
+            pages = range(pages.stop, last_page + 1)
+        else:
+            pages = range(pages.stop, pages.stop + WATCHLIST_BATCH_SIZE)
 
     print(f"Total movies found for {username}: {len(movies)}")
     return movies
@@ -154,9 +343,9 @@ def get_emby_user_id(emby_username, config):
     """
     url = f"{config['emby_url']}/Users?api_key={config['emby_api_key']}"
     try:
-        response = requests.get(url)
+        response = SESSION.get(url)
         response.raise_for_status()
-        users = response.json()
+        users = orjson.loads(response.content)
         for user in users:
             if user["Name"].lower() == emby_username.lower():
                 return user["Id"]
@@ -179,9 +368,9 @@ def init_playlist(user_id, playlist_name, config):
     """
     playlist_url = f"{config['emby_url']}/Users/{user_id}/Items?IncludeItemTypes=Playlist&api_key={config['emby_api_key']}"
     try:
-        response = requests.get(playlist_url)
+        response = SESSION.get(playlist_url)
         response.raise_for_status()
-        playlists = response.json().get("Items", [])
+        playlists = orjson.loads(response.content).get("Items", [])
 
         for playlist in playlists:
             if playlist["Name"].lower() == playlist_name.lower():
@@ -194,10 +383,10 @@ def init_playlist(user_id, playlist_name, config):
             "UserId": user_id,
             "MediaType": "Video"
         }
-        create_response = requests.post(create_url, json=payload)
+        create_response = SESSION.post(create_url, json=payload)
         create_response.raise_for_status()
         print(f"Playlist '{playlist_name}' created successfully for user '{user_id}'.")
-        return create_response.json().get("Id")
+        return orjson.loads(create_response.content).get("Id")
     except requests.exceptions.RequestException as e:
         print(f"Error creating playlist: {e}")
         return None
@@ -219,123 +408,356 @@ def add_to_playlist(playlist_id, items_to_add, config, user_id):
         "api_key": config["emby_api_key"]
     }
     try:
-        response = requests.post(add_items_url, params=params)
+        response = SESSION.post(add_items_url, params=params)
         response.raise_for_status()
         print(f"Successfully added {len(items_to_add)} items to the playlist.")
     except requests.exceptions.RequestException as e:
         print(f"Error adding items to playlist: {e}")
 
-def sync_playlist(playlist_id, watchlist_titles, user_id, config):
+def load_library_cache():
+    """
+    Load the cached Emby movie library from LIBRARY_CACHE_FILE.
+    
+    Returns:
+        dict or None: The cache contents, or None if there is no usable cache.
+    """
+    if not os.path.exists(LIBRARY_CACHE_FILE):
+        return None
+    try:
+        with open(LIBRARY_CACHE_FILE, 'rb') as file:
+            return orjson.loads(file.read())
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable Emby library cache '%s': %s", LIBRARY_CACHE_FILE, e)
+        return None
+
+def save_library_cache(cache):
+    """
+    Save the Emby movie library cache to LIBRARY_CACHE_FILE.
+    
+    Args:
+        cache (dict): The cache to save.
+    """
+    try:
+        with open(LIBRARY_CACHE_FILE, 'wb') as file:
+            file.write(orjson.dumps(cache))
+    except OSError as e:
+        log.warning("Could not write Emby library cache '%s': %s", LIBRARY_CACHE_FILE, e)
+
+async def fetch_emby_movies(client, min_date_last_saved=None):
+    """
+    Fetch movies from the Emby library in pages of EMBY_PAGE_SIZE.
+    
+    Args:
+        client (EmbyClient): The Emby API client.
+        min_date_last_saved (str, optional): Only return movies saved on or after this ISO 8601 timestamp.
+    
+    Yields:
+        list: The movie items of each page returned by Emby.
+    """
+    params = {"Recursive": "true", "IncludeItemTypes": "Movie"}
+    if min_date_last_saved:
+        params["MinDateLastSaved"] = min_date_last_saved
+
+    start_index = 0
+    while True:
+        movies = await client.items(**params, StartIndex=start_index, Limit=EMBY_PAGE_SIZE)
+        yield movies
+        if len(movies) < EMBY_PAGE_SIZE:
+            break
+        start_index += EMBY_PAGE_SIZE
+
+def library_entry(movie):
+    """
+    Convert an Emby movie item into a library entry.
+    
+    Args:
+        movie (dict): The movie item returned by Emby.
+    
+    Returns:
+        list or None: [name.lower(), runtime in minutes], or None if the movie has no runtime.
+    """
+    runtime_ticks = movie.get("RunTimeTicks")  # Emby stores runtime in ticks (1 tick = 100 nanoseconds)
+    if runtime_ticks is None:
+        log.warning("Movie '%s' does not have a RunTimeTicks. Skipping.", movie["Name"])
+        return None
+    return [movie["Name"].strip().lower(), runtime_ticks // TICKS_PER_MINUTE]
+
+async def load_emby_library(client):
+    """
+    Load the Emby movie library, using the on-disk cache in LIBRARY_CACHE_FILE.
+    When the cache belongs to the same server and is recent enough, only movies saved since the last sync
+    are fetched and merged into it; otherwise the whole library is fetched again.
+    
+    Args:
+        client (EmbyClient): The Emby API client.
+    
+    Returns:
+        dict: A mapping of Emby item ID to [name.lower(), runtime in minutes].
+    """
+    server_id = await client.server_id()
+    # Overlap with the previous sync so clock differences between this host and Emby can't lose changes
+    sync_started = (datetime.now(timezone.utc) - timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    cache = load_library_cache()
+
+    if (
+        cache
+        and cache.get("server_id") == server_id
+        and time.time() - cache.get("full_sync_time", 0) < LIBRARY_FULL_REFRESH_SECONDS
+    ):
+        library = cache["movies"]
+        full_sync_time = cache["full_sync_time"]
+        min_date_last_saved = cache["last_sync"]
+    else:
+        library = {}
+        full_sync_time = time.time()
+        min_date_last_saved = None
+
+    # Fold each page into the library as it arrives so only one page of raw items is held at a time
+    fetched = 0
+    async for movies in fetch_emby_movies(client, min_date_last_saved):
+        fetched += len(movies)
+        for movie in movies:
+            entry = library_entry(movie)
+            if entry is None:
+                library.pop(movie["Id"], None)
+            else:
+                library[movie["Id"]] = entry
+
+    if min_date_last_saved:
+        log.debug("Fetched %d movies changed in Emby since %s.", fetched, min_date_last_saved)
+    else:
+        log.debug("Fetched %d movies from Emby library.", fetched)
+
+    save_library_cache({
+        "server_id": server_id,
+        "last_sync": sync_started,
+        "full_sync_time": full_sync_time,
+        "movies": library
+    })
+    return library
+
+async def find_emby_movie(client, title):
+    """
+    Search the Emby library for movies matching a title.
+    The title is searched for without punctuation, so Emby finds names that only differ from it in punctuation.
+    
+    Args:
+        client (EmbyClient): The Emby API client.
+        title (str): The movie title to search for.
+    
+    Returns:
+        list: Up to five movie items returned by Emby's search.
+    """
+    search_term = " ".join(utils.default_process(title).split())
+    return await client.items(Recursive="true", IncludeItemTypes="Movie", SearchTerm=search_term, Limit=5)
+
+async def search_emby_library(client, titles):
+    """
+    Look up each watchlist title with Emby's search instead of fetching the whole library.
+    
+    Args:
+        client (EmbyClient): The Emby API client.
+        titles (list): The deduplicated, stripped movie titles from Letterboxd.
+    
+    Returns:
+        dict or None: The found movies in the same form as load_emby_library, or None if the search failed
+        or found no matching movie for more than half of the titles.
+    """
+    semaphore = asyncio.Semaphore(EMBY_SEARCH_CONCURRENCY)
+
+    async def search(title):
+        async with semaphore:
+            return await find_emby_movie(client, title)
+
+    try:
+        results = await asyncio.gather(*(search(title) for title in titles))
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        log.warning("Error searching Emby, falling back to the full library: %s", e)
+        return None
+
+    library = {}
+    misses = 0
+    for title, movies in zip(titles, results):
+        found = {}
+        for movie in movies:
+            entry = library_entry(movie)
+            if entry is not None:
+                found[movie["Id"]] = entry
+        # A title counts as a miss unless one of its search results matches it the way sync_playlist will
+        found_names = list(dict.fromkeys(name for name, _ in found.values()))
+        if match_titles([title.lower()], found_names)[0] is None:
+            misses += 1
+        library.update(found)
+
+    if misses > len(titles) // 2:
+        log.info("Emby search found no match for %d of %d titles, falling back to the full library.", misses, len(titles))
+        return None
+
+    log.debug("Found %d movies in Emby by searching for %d titles.", len(library), len(titles))
+    return library
+
+def last_word(title):
+    """
+    Return the last word of a title after rapidfuzz's default processing (lowercase, punctuation stripped).
+    
+    Args:
+        title (str): The title.
+    
+    Returns:
+        str: The last word, or an empty string if the title has none.
+    """
+    words = utils.default_process(title).split()
+    return words[-1] if words else ""
+
+def match_titles(titles, names):
+    """
+    Match watchlist titles to Emby movie names.
+    Exact matches are used as-is; the remaining titles are scored against every name in a single
+    rapidfuzz cdist call and matched to the best-scoring name if it reaches FUZZY_MATCH_THRESHOLD.
+    Whole titles are compared after stripping punctuation, so a title never matches a longer name it is part of
+    (e.g. 'up' and 'upgrade'), and the last words must agree so sequels and plurals
+    (e.g. 'rocky ii' and 'rocky iii', 'alien' and 'aliens') are not matched to each other.
+
+    Args:
+        titles (list): Lowercased watchlist titles.
+        names (list): Lowercased Emby movie names.
+
+    Returns:
+        list: The matched Emby name for each title, or None where no match was found.
+    """
+    known_names = set(names)
+    matches = [title if title in known_names else None for title in titles]
+    unmatched = [i for i, match in enumerate(matches) if match is None]
+    if not unmatched or not names:
+        return matches
+
+    # Scores below the cutoff are reported as 0
+    scores = process.cdist(
+        [titles[i] for i in unmatched], names,
+        scorer=fuzz.ratio, processor=utils.default_process, score_cutoff=FUZZY_MATCH_THRESHOLD, workers=-1
+    )
+    # Drop candidates whose last word differs before picking the best one, so a tie with a sequel cannot hide the match
+    title_last_words = np.array([last_word(titles[i]) for i in unmatched], dtype=object)
+    name_last_words = np.array([last_word(name) for name in names], dtype=object)
+    scores[title_last_words[:, None] != name_last_words[None, :]] = 0
+    best = np.argmax(scores, axis=1)
+    for row, i in enumerate(unmatched):
+        if scores[row, best[row]] > 0:
+            matches[i] = names[best[row]]
+            log.debug("Fuzzy matched '%s' to '%s' (score %.0f).", titles[i], matches[i], scores[row, best[row]])
+    return matches
+
+async def sync_playlist(client, playlist_id, watchlist_titles, user_id, library):
     """
     Sync movies from a Letterboxd watchlist to an Emby playlist without creating duplicates based on movie name and runtime.
 
     Args:
+        client (EmbyClient): The Emby API client.
         playlist_id (str): The ID of the Emby playlist.
-        watchlist_titles (list): A list of movie titles from Letterboxd.
+        watchlist_titles (list): The deduplicated, stripped movie titles from Letterboxd.
         user_id (str): The Emby user ID.
-        config (dict): The configuration dictionary containing Emby details.
+        library (dict): The Emby movies to match against, as returned by load_emby_library or search_emby_library.
     """
-    # Fetch Emby movie library
-    library_url = f"{config['emby_url']}/Items?Recursive=true&IncludeItemTypes=Movie&api_key={config['emby_api_key']}"
-    try:
-        response = requests.get(library_url)
-        response.raise_for_status()
-        movies = response.json()["Items"]
-        logging.debug(f"Fetched {len(movies)} movies from Emby library.")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching Emby movie library: {e}")
-        return
-    except ValueError:
-        logging.error("Error parsing JSON response from Emby movie library.")
-        return
-
-    # Create a mapping from name.lower() to list of (Runtime, Emby ID)
-    name_to_runtime_ids = {}
-    for movie in movies:
-        name = movie["Name"].strip().lower()
-        runtime_ticks = movie.get("RunTimeTicks")  # Emby stores runtime in ticks (1 tick = 100 nanoseconds)
-        if runtime_ticks is None:
-            logging.warning(f"Movie '{movie['Name']}' does not have a RunTimeTicks. Skipping.")
+    # Match each watchlist title (just the movie name, without runtime) to an Emby movie name
+    library_names = list(dict.fromkeys(name for name, _ in library.values()))
+    matched_names = match_titles([title.lower() for title in watchlist_titles], library_names)
+    # Only Emby movies with a matched name are ever looked up
+    wanted = {name for name in matched_names if name is not None}
+
+    # Lay the wanted movies out as parallel arrays of Emby IDs and runtimes, indexed by name.lower() -> row numbers
+    emby_ids = []
+    runtimes = []
+    name_to_rows = {}
+    for emby_id, (name, runtime_minutes) in library.items():
+        if name not in wanted:
             continue
-        # Convert RuntimeTicks to minutes
-        runtime_minutes = runtime_ticks // (10**7 * 60)  # 10^7 ticks per second, 60 seconds per minute
-        if name in name_to_runtime_ids:
-            name_to_runtime_ids[name].append((runtime_minutes, movie["Id"]))
-        else:
-            name_to_runtime_ids[name] = [(runtime_minutes, movie["Id"])]
-    logging.debug(f"Created mapping of (name, runtime) to Emby IDs: {name_to_runtime_ids}")
+        name_to_rows.setdefault(name, []).append(len(emby_ids))
+        emby_ids.append(emby_id)
+        runtimes.append(runtime_minutes)
+    emby_ids = np.array(emby_ids, dtype=object)
+    runtimes = np.array(runtimes, dtype=np.int32)
+    name_to_rows = {name: np.array(rows, dtype=np.intp) for name, rows in name_to_rows.items()}
+    log.debug("Indexed %d matching Emby movies under %d names.", len(emby_ids), len(name_to_rows))
 
     # Fetch current playlist items
     try:
-        playlist_items_url = f"{config['emby_url']}/Playlists/{playlist_id}/Items?api_key={config['emby_api_key']}"
-        playlist_response = requests.get(playlist_items_url)
-        playlist_response.raise_for_status()
-        current_playlist = playlist_response.json().get("Items", [])
-        # Create a set of (name.lower(), runtime_minutes) for existing playlist items
-        current_playlist_title_runtimes = set()
+        current_playlist = await client.playlist_items(playlist_id)
+        # Group the runtimes (in minutes) of existing playlist items by name.lower()
+        existing_runtimes_by_name = {}
         for item in current_playlist:
             name = item["Name"].strip().lower()
+            if name not in wanted:
+                continue
             runtime_ticks = item.get("RunTimeTicks")
             if runtime_ticks is None:
                 # Attempt to extract runtime from another field if available
-                logging.warning(f"Playlist item '{item['Name']}' does not have a RunTimeTicks. Skipping.")
+                log.warning("Playlist item '%s' does not have a RunTimeTicks. Skipping.", item["Name"])
                 continue
-            runtime_minutes = runtime_ticks // (10**7 * 60)
-            current_playlist_title_runtimes.add((name, runtime_minutes))
-        logging.debug(f"Current playlist has {len(current_playlist_title_runtimes)} unique (name, runtime) pairs.")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching current playlist items: {e}")
+            existing_runtimes_by_name.setdefault(name, set()).add(runtime_ticks // TICKS_PER_MINUTE)
+        existing_runtimes_by_name = {
+            name: np.fromiter(runtimes_for_name, dtype=np.int32, count=len(runtimes_for_name))
+            for name, runtimes_for_name in existing_runtimes_by_name.items()
+        }
+        log.debug(
+            "Current playlist has %d unique matching (name, runtime) pairs.",
+            sum(map(len, existing_runtimes_by_name.values()))
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        log.error("Error fetching current playlist items: %s", e)
         return
     except ValueError:
-        logging.error("Error parsing JSON response from Emby playlist items.")
+        log.error("Error parsing JSON response from Emby playlist items.")
         return
 
     # Determine which Emby IDs to add
     items_to_add = []
-    for title in watchlist_titles:
-        logging.debug(f"Processing watchlist movie: {title}")
-        # Assuming the watchlist title is just the movie name without runtime
-        name_key = title.strip().lower()
-        if name_key in name_to_runtime_ids:
-            # Get all Emby entries for this name
-            emby_entries = name_to_runtime_ids[name_key]
-            # Check if any of the Emby entries have the same runtime as an existing playlist item
+    handled_names = set()
+    for title, name_key in zip(watchlist_titles, matched_names):
+        log.debug("Processing watchlist movie: %s", title)
+        # Different titles can fuzzy match the same Emby movie; only handle it once
+        if name_key in handled_names:
+            log.debug("Movie '%s' matches the already handled Emby movie '%s'. Skipping.", title, name_key)
+            continue
+        if name_key is not None:
+            handled_names.add(name_key)
+            # Get the rows of all Emby entries for this name
+            rows = name_to_rows[name_key]
+            # Check if any of the Emby entries has a runtime within the tolerance of an existing playlist item,
+            # since remuxes and different releases of the same movie often differ by a minute
+            existing_runtimes = existing_runtimes_by_name.get(name_key)
             duplicate_found = False
-            for runtime, emby_id in emby_entries:
-                if (name_key, runtime) in current_playlist_title_runtimes:
-                    logging.debug(f"Duplicate found for movie '{title}' with runtime {runtime} minutes. Skipping.")
+            if existing_runtimes is not None:
+                candidate_runtimes = runtimes[rows]
+                close = np.abs(candidate_runtimes[:, None] - existing_runtimes[None, :]) <= RUNTIME_TOLERANCE_MINUTES
+                duplicates = close.any(axis=1)
+                if duplicates.any():
+                    runtime = candidate_runtimes[duplicates.argmax()]
+                    log.debug("Duplicate found for movie '%s' with runtime %d minutes. Skipping.", title, runtime)
                     duplicate_found = True
-                    break  # No need to check other Emby entries for this title
             if not duplicate_found:
                 # Add the first Emby ID (or implement a selection strategy if needed)
-                runtime_to_add, emby_id_to_add = emby_entries[0]
+                runtime_to_add, emby_id_to_add = runtimes[rows[0]], emby_ids[rows[0]]
                 items_to_add.append(emby_id_to_add)
-                logging.debug(f"Adding movie '{title}' with runtime {runtime_to_add} minutes (ID: {emby_id_to_add}) to playlist.")
+                log.debug(
+                    "Adding movie '%s' with runtime %d minutes (ID: %s) to playlist.", title, runtime_to_add, emby_id_to_add
+                )
         else:
-            logging.warning(f"No matching Emby entry found for movie: {title}")
+            log.warning("No matching Emby entry found for movie: %s", title)
 
-    logging.info(f"Total new movies to add: {len(items_to_add)}")
+    log.info("Total new movies to add: %d", len(items_to_add))
 
     # Add new items to the playlist
     if items_to_add:
-        add_items_url = f"{config['emby_url']}/Playlists/{playlist_id}/Items"
-        params = {
-            "Ids": ",".join(items_to_add),
-            "UserId": user_id,
-            "api_key": config["emby_api_key"]
-        }
-        logging.debug(f"Adding items to playlist {playlist_id}: {items_to_add}")
+        log.debug("Adding items to playlist %s: %s", playlist_id, items_to_add)
         try:
-            response = requests.post(add_items_url, params=params)
-            response.raise_for_status()
-            logging.info(f"Successfully added {len(items_to_add)} items to the playlist.")
-        except requests.exceptions.HTTPError as http_err:
-            logging.error(f"HTTP error occurred while adding items to playlist: {http_err}")
-            logging.error(f"Response content: {response.text}")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error adding items to playlist: {e}")
+            await client.add(playlist_id, items_to_add, user_id)
+            log.info("Successfully added %d items to the playlist.", len(items_to_add))
+        except aiohttp.ClientResponseError as http_err:
+            log.error("HTTP error occurred while adding items to playlist: %s", http_err)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.error("Error adding items to playlist: %s", e)
     else:
-        logging.info("No new movies to add to the playlist.")
+        log.info("No new movies to add to the playlist.")
 
 def run_sync(config):
     """
@@ -344,24 +766,91 @@ def run_sync(config):
     Args:
         config (dict): The configuration dictionary containing user and Emby details.
     """
-    for user in config["users"]:
-        letterboxd_username = user["letterboxd_username"]
-        emby_username = user["emby_username"]
-        user_id = user.get("user_id")
-        playlist_id = user.get("playlist_id")
+    async def run():
+        async with create_http_session() as session:
+            await run_sync_async(session, config)
 
-        print(f"\nProcessing user: {emby_username} ({letterboxd_username})")
+    asyncio.run(run())
 
-        if not user_id or not playlist_id:
-            print(f"Missing userId or playlistId for user '{letterboxd_username}'. Skipping...")
-            continue
+async def run_sync_async(session, config):
+    """
+    Asynchronous body of run_sync. All Letterboxd and Emby requests share the given HTTP session.
+    Up to USER_SYNC_CONCURRENCY users are synced concurrently. The Emby library is loaded at most once,
+    the first time a user needs it, and shared by all users.
+    
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        config (dict): The configuration dictionary containing user and Emby details.
+    """
+    client = EmbyClient(config, session)
+    library = None
+    library_lock = asyncio.Lock()
+
+    async def get_library():
+        nonlocal library
+        async with library_lock:
+            if library is None:
+                library = await load_emby_library(client)
+        return library
 
-        watchlist_titles = get_letterboxd_watchlist(letterboxd_username)
-        print(f"Total movies found for {letterboxd_username}: {len(watchlist_titles)}")
+    semaphore = asyncio.Semaphore(USER_SYNC_CONCURRENCY)
 
-        sync_playlist(playlist_id, watchlist_titles, user_id, config)
+    async def sync_bounded(user):
+        async with semaphore:
+            await sync_one_user(session, client, user, get_library)
+
+    await asyncio.gather(*(sync_bounded(user) for user in config["users"]))
     print("\nSync complete.")
 
+async def sync_one_user(session, client, user, get_library):
+    """
+    Sync a single user's Letterboxd watchlist to their Emby playlist.
+    Small watchlists are looked up with Emby's search while there is no library cache yet;
+    otherwise the watchlist is matched against the full Emby library.
+    
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        client (EmbyClient): The Emby API client.
+        user (dict): The user entry from the configuration.
+        get_library (callable): Coroutine function returning the shared Emby library from load_emby_library.
+    """
+    letterboxd_username = user["letterboxd_username"]
+    emby_username = user["emby_username"]
+    user_id = user.get("user_id")
+    playlist_id = user.get("playlist_id")
+
+    print(f"\nProcessing user: {emby_username} ({letterboxd_username})")
+
+    if not user_id or not playlist_id:
+        print(f"Missing userId or playlistId for user '{letterboxd_username}'. Skipping...")
+        return
+
+    watchlist_titles = await get_letterboxd_watchlist(session, letterboxd_username)
+    print(f"Total movies found for {letterboxd_username}: {len(watchlist_titles)}")
+
+    # Drop repeated watchlist titles, keeping watchlist order, before any Emby lookups
+    titles_by_key = {}
+    for title in watchlist_titles:
+        title = title.strip()
+        titles_by_key.setdefault(title.lower(), title)
+    watchlist_titles = list(titles_by_key.values())
+
+    library = None
+    if len(watchlist_titles) <= SEARCH_LOOKUP_MAX_TITLES and not os.path.exists(LIBRARY_CACHE_FILE):
+        library = await search_emby_library(client, watchlist_titles)
+    if library is None:
+        # Load the Emby movie library (item ID -> [name, runtime in minutes])
+        try:
+            library = await get_library()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.error("Error fetching Emby movie library: %s", e)
+            return
+        except ValueError:
+            log.error("Error parsing JSON response from Emby movie library.")
+            return
+
+    await sync_playlist(client, playlist_id, watchlist_titles, user_id, library)
+
 def add_new_user(config):
     """
     Add a new Letterboxd user and link them with an Emby username.
@@ -409,12 +898,23 @@ def run_daemon_mode(config):
 
     print(f"Starting daemon mode. Syncing every {interval_seconds} seconds...")
 
+    # A single event loop and HTTP session are kept across iterations so connections are reused
+    async def run():
+        async with create_http_session() as session:
+            while True:
+                print("\n--- Running Sync ---")
+                await run_sync_async(session, config)
+                if not os.path.exists(LIBRARY_CACHE_FILE):
+                    # Seed the library cache so later iterations use the delta sync instead of searching every title
+                    try:
+                        await load_emby_library(EmbyClient(config, session))
+                    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                        log.warning("Could not seed the Emby library cache: %s", e)
+                print(f"Waiting for {interval_seconds} seconds before next sync...")
+                await asyncio.sleep(interval_seconds)
+
     try:
-        while True:
-            print("\n--- Running Sync ---")
-            run_sync(config)
-            print(f"Waiting for {interval_seconds} seconds before next sync...")
-            time.sleep(interval_seconds)
+        asyncio.run(run())
     except KeyboardInterrupt:
         print("Daemon mode stopped by user.")
     except Exception as e:
@@ -460,5 +960,4 @@ def main():
             print("Invalid argument provided. Use -h for help.")
 
 if __name__ == "__main__":
-    init_dependencies()
     main()